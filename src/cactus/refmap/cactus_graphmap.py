@@ -12,6 +12,7 @@ from argparse import ArgumentParser
 import xml.etree.ElementTree as ET
 import copy
 import timeit
+import gzip
 
 from operator import itemgetter
 
@@ -431,11 +432,12 @@ def extract_paf_from_gfa(job, gfa_id, gfa_path, ref_event, graph_event, ignore_p
     cactus_call(parameters=cmd, outfile=paf_path)
     return job.fileStore.writeGlobalFile(paf_path)
 
-def filter_paf(job, paf_id, config, reference=None):
+def filter_paf(job, paf_id, config, reference=None, is_gz=False):
     """ run basic paf-filtering.  these are quick filters that are best to do on-the-fly when reading the paf and 
-        as such, they are called by cactus-graphmap-split and cactus-align, not here """
+        as such, they are called by cactus-graphmap-split and cactus-align, not here.
+        if is_gz, the input is decompressed on the fly (output is always uncompressed) """
     work_dir = job.fileStore.getLocalTempDir()
-    paf_path = os.path.join(work_dir, 'mg.paf')
+    paf_path = os.path.join(work_dir, 'mg.paf.gz' if is_gz else 'mg.paf')
     filter_paf_path = os.path.join(work_dir, 'mg.paf.filter')
     job.fileStore.readGlobalFile(paf_id, paf_path)
 
@@ -443,7 +445,7 @@ def filter_paf(job, paf_id, config, reference=None):
     min_mapq = getOptionalAttrib(findRequiredNode(config.xmlRoot, "graphmap"), "minMAPQ", typeFn=int, default=0)
     min_ident = getOptionalAttrib(findRequiredNode(config.xmlRoot, "graphmap"), "minIdentity", typeFn=float, default=0)
     RealtimeLogger.info("Running PAF filter with minBlock={} minMAPQ={} minIdentity={}".format(min_block, min_mapq, min_ident))
-    with open(paf_path, 'r') as paf_file, open(filter_paf_path, 'w') as filter_paf_file:
+    with (gzip.open(paf_path, 'rt') if is_gz else open(paf_path, 'r')) as paf_file, open(filter_paf_path, 'w') as filter_paf_file:
         for line in paf_file:
             toks = line.split('\t')
             is_ref = reference and toks[0].startswith('id={}|'.format(reference))
@@ -9,6 +9,8 @@ import copy
 import timeit
 import shutil
 import re
+import mmap
+from concurrent.futures import ThreadPoolExecutor
 
 from operator import itemgetter
 
@@ -17,12 +19,13 @@ from cactus.progressive.multiCactusTree import MultiCactusTree
 from cactus.shared.common import setupBinaries, importSingularityImage
 from cactus.shared.common import cactusRootPath
 from cactus.shared.configWrapper import ConfigWrapper
-from cactus.shared.common import makeURL, catFiles
+from cactus.shared.common import makeURL, catFiles, cat_seq_dir, sendfile_copy
+from cactus.shared.common import import_files_parallel, export_files_parallel
 from cactus.shared.common import enableDumpStack
 from cactus.shared.common import cactus_override_toil_options
 from cactus.shared.common import cactus_call
 from cactus.shared.common import getOptionalAttrib, findRequiredNode
-from cactus.shared.common import unzip_gz, write_s3
+from cactus.shared.common import write_s3
 from cactus.shared.common import get_faidx_subpath_rename_cmd
 from cactus.shared.common import cactus_clamp_memory
 from cactus.shared.version import cactus_commit
@@ -76,8 +79,7 @@ def main():
     enableDumpStack()
 
     if options.outDir and not options.outDir.startswith('s3://'):
-        if not os.path.isdir(options.outDir):
-            os.makedirs(options.outDir)
+        os.makedirs(options.outDir, exist_ok=True)
         
     # Mess with some toil options to create useful defaults.
     cactus_override_toil_options(options)
@@ -155,17 +157,24 @@ def cactus_graphmap_split(options):
             # validate the sample names
             check_sample_names(seqFile.pathMap.keys(), options.reference)
                         
+            # list of (genome, url) to import
+            to_import = []
             for genome, seq in seqFile.pathMap.items():
                 if genome in leaves:
                     if os.path.isdir(seq):
+                        # concatenate the directory's fastas into one (uncompressed) file
                         tmpSeq = getTempFile()
-                        catFiles([os.path.join(seq, subSeq) for subSeq in os.listdir(seq)], tmpSeq)
+                        cat_seq_dir(seq, tmpSeq)
                         seq = tmpSeq
                     seq = makeURL(seq)
                     logger.info("Importing {}".format(seq))
-                    input_seq_id_map[genome] = toil.importFile(seq)
+                    to_import.append((genome, seq))
                     input_name_map[genome] = os.path.basename(seq)
 
+            seq_ids = import_files_parallel(toil, [seq for genome, seq in to_import])
+            for (genome, seq), seq_id in zip(to_import, seq_ids):
+                input_seq_id_map[genome] = seq_id
+
             # run the workflow
             wf_output = toil.start(Job.wrapJobFn(graphmap_split_workflow, options, config, input_seq_id_map, input_name_map,
                                                  gfa_id, options.minigraphGFA,
@@ -217,16 +226,18 @@ def graphmap_split_workflow(job, options, config, seq_id_map, seq_name_map, gfa_
         ref_contigs = options.refContigs
     
     # use file extension to sniff out compressed input
-    if gfa_path.endswith(".gz"):
-        gfa_id = root_job.addChildJobFn(unzip_gz, gfa_path, gfa_id, delete_original=False, disk=gfa_id.size * 10).rv()
+    # note: we don't unzip in separate jobs, rather filter_paf and split_gfa decompress on the fly
+    # (the size estimates below are for the uncompressed data they write out)
+    gfa_gz = gfa_path.endswith(".gz")
+    if gfa_gz:
         gfa_size *= 10
-    if paf_path.endswith(".gz"):
-        paf_id = root_job.addChildJobFn(unzip_gz, paf_path, paf_id, delete_original=False, disk=paf_id.size * 10).rv()
+    paf_gz = paf_path.endswith(".gz")
+    if paf_gz:
         paf_size *= 10
 
     # do some basic paf filtering
     paf_filter_mem = max(paf_id.size * 10, 2**32)
-    paf_filter_job = root_job.addFollowOnJobFn(filter_paf, paf_id, config, reference=options.reference,
+    paf_filter_job = root_job.addFollowOnJobFn(filter_paf, paf_id, config, reference=options.reference, is_gz=paf_gz,
                                                disk = paf_id.size * 10, memory=cactus_clamp_memory(paf_filter_mem))
     paf_id = paf_filter_job.rv()
     root_job = paf_filter_job
@@ -236,8 +247,13 @@ def graphmap_split_workflow(job, options, config, seq_id_map, seq_name_map, gfa_
         mask_bed_id = sanitize_job.addFollowOnJobFn(get_mask_bed, seq_id_map, options.maskFilter).rv()
         
     # use rgfa-split to split the gfa and paf up by contig
+    # (the extra cores are used to compress and write its output)
+    split_cores = getOptionalAttrib(findRequiredNode(config.xmlRoot, "graphmap"), "cpu", typeFn=int, default=1)
+    if options.batchSystem.lower() in ['single_machine', 'singlemachine']:
+        split_cores = min(split_cores, cactus_cpu_count(), int(options.maxCores) if options.maxCores else sys.maxsize)
     split_gfa_job = root_job.addFollowOnJobFn(split_gfa, config, gfa_id, [paf_id], ref_contigs,
-                                              options.otherContig, options.reference, mask_bed_id,
+                                              options.otherContig, options.reference, mask_bed_id, gfa_gz=gfa_gz,
+                                              cores=split_cores,
                                               disk=(gfa_size + paf_size) * 5,
                                               memory=cactus_clamp_memory((gfa_size + paf_size) * 3))
 
@@ -300,7 +316,7 @@ def detect_ref_contigs(job, config, options, seq_id_map):
                 break
             ref_contigs.add(contig_len[0])
 
-    ref_contigs = sorted(list(ref_contigs))
+    ref_contigs = sorted(ref_contigs)
 
     msg = "auto-detected --refContigs {}".format(' '.join(ref_contigs))
     if len(ref_contigs) < len(sorted_contigs):
@@ -308,7 +324,7 @@ def detect_ref_contigs(job, config, options, seq_id_map):
 
     RealtimeLogger.info(msg)
 
-    return sorted(list(ref_contigs))
+    return ref_contigs
     
 
 def get_mask_bed(job, seq_id_map, min_length):
@@ -326,9 +342,9 @@ def cat_beds(job, bed_ids):
     catFiles(in_beds, out_bed)
     return job.fileStore.writeGlobalFile(out_bed)
     
-def split_gfa(job, config, gfa_id, paf_ids, ref_contigs, other_contig, reference_event, mask_bed_id):
+def split_gfa(job, config, gfa_id, paf_ids, ref_contigs, other_contig, reference_event, mask_bed_id, gfa_gz=False):
     """ Use rgfa-split to divide a GFA and PAF into chromosomes.  The GFA must be in minigraph RGFA output using
-    the desired reference. """
+    the desired reference. If gfa_gz is True, the GFA is gzipped and gets decompressed locally here """
 
     if not paf_ids:
         # we can bypass when, ex, doing second pass on ambiguous sequences but not are present
@@ -348,7 +364,14 @@ def split_gfa(job, config, gfa_id, paf_ids, ref_contigs, other_contig, reference
         job.fileStore.readGlobalFile(mask_bed_id, bed_path)
 
     if gfa_id:
-        job.fileStore.readGlobalFile(gfa_id, gfa_path)
+        if gfa_gz:
+            # rgfa-split needs a regular file, so we unzip here rather than in its own job
+            job.fileStore.readGlobalFile(gfa_id, gfa_path + '.gz')
+            cactus_call(parameters=['gzip', '-dc', gfa_path + '.gz'], outfile=gfa_path)
+            # don't keep the compressed copy around in scratch while rgfa-split runs
+            os.remove(gfa_path + '.gz')
+        else:
+            job.fileStore.readGlobalFile(gfa_id, gfa_path)
         
     paf_paths = []
     for i, paf_id in enumerate(paf_ids):
@@ -417,6 +440,8 @@ def split_gfa(job, config, gfa_id, paf_ids, ref_contigs, other_contig, reference
     cactus_call(parameters=cmd, work_dir=work_dir, job_memory=job.memory)
 
     output_id_map = {}
+    # list of (name, ext, local path) to write to the filestore
+    output_items = []
     for out_name in os.listdir(work_dir):
         file_name, ext = os.path.splitext(out_name)
         if file_name.startswith(os.path.basename(out_prefix)) and ext in [".gfa", ".paf", ".fa_contigs"] and \
@@ -435,7 +460,23 @@ def split_gfa(job, config, gfa_id, paf_ids, ref_contigs, other_contig, reference
                 cmd = get_faidx_subpath_rename_cmd()
                 cmd += ['-e', 's/ /\t/g', '-i', os.path.join(work_dir, out_name)]
                 cactus_call(parameters=cmd)
-            output_id_map[name][ext[1:]] = job.fileStore.writeGlobalFile(os.path.join(work_dir, out_name))
+            output_items.append((name, ext[1:], os.path.join(work_dir, out_name)))
+
+    # write everything to the filestore in parallel, splitting the job's cores between the writers
+    write_workers = max(1, min(int(job.cores), len(output_items)))
+    bgzip_threads = max(1, int(job.cores) // write_workers)
+
+    # the gfas are only exported as-is, so we compress them first (but not the pafs, which cactus-align needs uncompressed)
+    def write_output(path, compress):
+        if compress:
+            cactus_call(parameters=['bgzip', '--threads', str(bgzip_threads), path])
+            path += '.gz'
+        return job.fileStore.writeGlobalFile(path)
+
+    with ThreadPoolExecutor(max_workers=write_workers) as write_pool:
+        futures = [(name, ext, write_pool.submit(write_output, path, ext == 'gfa')) for name, ext, path in output_items]
+        for name, ext, future in futures:
+            output_id_map[name][ext] = future.result()
             
     return output_id_map, job.fileStore.writeGlobalFile(log_path)
 
@@ -448,6 +489,14 @@ def split_fas(job, seq_id_map, seq_name_map, split_id_map):
     root_job = Job()
     job.addChild(root_job)
 
+    # read the .fa_contigs files once to find out which contigs go where for every (non-empty) event
+    # (the whole index is held in memory, so we size it from the lists)
+    contig_lists_size = sum([split_id_map[ref_contig]['fa_contigs'].size for ref_contig in split_id_map.keys()])
+    index_job = root_job.addChildJobFn(build_contig_index, split_id_map,
+                                       [event for event, fa_id in seq_id_map.items() if fa_id.size],
+                                       disk=2 * contig_lists_size,
+                                       memory=cactus_clamp_memory(8 * contig_lists_size))
+
     # map event name to dict of contgs.  ex fa_contigs["CHM13"]["chr13"] = file_id
     fa_contigs = {}
     # map event name to dict of contig sizes ex fa_contigs["CHM13"]["chr13"] = N
@@ -458,17 +507,43 @@ def split_fas(job, seq_id_map, seq_name_map, split_id_map):
     for event, fa_id in seq_id_map.items():
         fa_path = seq_name_map[event]
         if fa_id.size:
-            split_job = root_job.addChildJobFn(split_fa_into_contigs, event, fa_id, fa_path, split_id_map,
-                                               strip_prefix=False, 
-                                               disk=fa_id.size * 3)
+            split_job = index_job.addFollowOnJobFn(split_fa_into_contigs, event, fa_id, fa_path, index_job.rv(event),
+                                                   strip_prefix=False, 
+                                                   disk=fa_id.size * 3)
             fa_contigs[event] = split_job.rv(0)
             fa_contig_sizes[event] = split_job.rv(1)
 
     return fa_contigs, fa_contig_sizes
 
-def split_fa_into_contigs(job, event, fa_id, fa_name, split_id_map, strip_prefix=False):
+def build_contig_index(job, split_id_map, events):
+    """ read the .fa_contigs files made by rgfa-split and make a table of contig names
+    for each event and reference contig.  ex contig_index["CHM13"]["chr13"] = ["id=CHM13|chr13", ...] 
+    (every reference contig is present for every event, even if its list is empty) """
+    work_dir = job.fileStore.getLocalTempDir()
+    contig_index = {}
+    for event in events:
+        contig_index[event] = {}
+        for ref_contig in split_id_map.keys():
+            contig_index[event][ref_contig] = []
+
+    # pull out all the contig names along with their events in one pass
+    contig_re = re.compile(r'^(id=([^|\n]*)\|[^\n]*)', re.MULTILINE)
+    for ref_contig in split_id_map.keys():
+        query_contig_list_id = split_id_map[ref_contig]['fa_contigs']
+        list_path = os.path.join(work_dir, '{}.fa_contigs'.format(ref_contig))
+        job.fileStore.readGlobalFile(query_contig_list_id, list_path)
+        # event -> list of contigs, for just this reference contig
+        ref_contig_index = {event : contig_index[event][ref_contig] for event in contig_index}
+        with open(list_path, 'r') as list_file:
+            for query_contig, event in contig_re.findall(list_file.read()):
+                event_contigs = ref_contig_index.get(event)
+                if event_contigs is not None:
+                    event_contigs.append(query_contig.rstrip())
+    return contig_index
+
+def split_fa_into_contigs(job, event, fa_id, fa_name, contig_index, strip_prefix=False):
     """ Use samtools turn on fasta into one for each contig. this relies on the informatino in .fa_contigs
-    files made by rgfa-split """
+    files made by rgfa-split, as indexed for this event by build_contig_index """
 
     # download the fasta
     work_dir = job.fileStore.getLocalTempDir()
@@ -481,47 +556,95 @@ def split_fa_into_contigs(job, event, fa_id, fa_name, split_id_map, strip_prefix
     contig_fa_dict = {}
     contig_size_dict = {}
 
-    for ref_contig in split_id_map.keys():
-        query_contig_list_id = split_id_map[ref_contig]['fa_contigs']
-        list_path = os.path.join(work_dir, '{}.fa_contigs'.format(ref_contig))
-        job.fileStore.readGlobalFile(query_contig_list_id, list_path)
-        faidx_input_path = os.path.join(work_dir, '{}.fa_contigs.clean'.format(ref_contig))
-        contig_count = 0
-        with open(list_path, 'r') as list_file, open(faidx_input_path, 'w') as clean_file:
-            for line in list_file:
-                query_contig = line.strip()
-                if query_contig.startswith(unique_id):
-                    if strip_prefix:
-                        query_contig = query_contig[len(unique_id):]                        
-                    clean_file.write('{}\n'.format(query_contig))
-                    contig_count += 1
-        contig_fasta_path = os.path.join(work_dir, '{}_{}.fa'.format(event, ref_contig))
-        if contig_count > 0:
-            cmd = [['samtools', 'faidx', fa_path, '--region-file', faidx_input_path]]
-            # transform chr1:10-15 (1-based inclusive) into chr1_sub_9_15 (0-based end open)
-            # this is a format that contains no special characters in order to make assembly hubs
-            # happy.  But it does require conversion going into vg which wants chr[9-15] and
-            # hal2vg is updated to do this autmatically
-            cmd.append(get_faidx_subpath_rename_cmd())
-            if is_gz:
-                cmd.append(['bgzip', '--threads', str(job.cores)])
-            cactus_call(parameters=cmd, outfile=contig_fasta_path)
-
-            # now get the total sequence size
-            size_cmd = [['cat', contig_fasta_path], ['grep', '-v', '>'], ['wc'], ['awk', '{printf \"%f\", $3-$1}']]
-            if is_gz:
-                size_cmd[0] = ['bgzip', '-dc', contig_fasta_path, '--threads', str(job.cores)]
-            num_bases = int(float(cactus_call(parameters=size_cmd, check_output=True).strip()))
-        else:
-            # TODO: review how cases like this are handled
-            with open(contig_fasta_path, 'w') as empty_file:
-                empty_file.write("")
-            num_bases = 0
-        contig_fa_dict[ref_contig] = job.fileStore.writeGlobalFile(contig_fasta_path)
-        contig_size_dict[ref_contig] = num_bases
+    # make a single region list for all the reference contigs so that samtools only needs to be run once.
+    # it outputs the regions in the order they are given, so we just remember how many
+    # there are for each reference contig in order to split its output back up
+    faidx_regions = []
+    ref_contig_counts = []
+    for ref_contig, query_contigs in contig_index.items():
+        if strip_prefix:
+            query_contigs = [query_contig[len(unique_id):] for query_contig in query_contigs]
+        faidx_regions += query_contigs
+        ref_contig_counts.append((ref_contig, len(query_contigs)))
+
+    faidx_output_path = os.path.join(work_dir, '{}.fa_contigs.fa'.format(event))
+    if faidx_regions:
+        # the region list is passed to samtools via stdin
+        cmd = [['samtools', 'faidx', fa_path, '--region-file', '-']]
+        # transform chr1:10-15 (1-based inclusive) into chr1_sub_9_15 (0-based end open)
+        # this is a format that contains no special characters in order to make assembly hubs
+        # happy.  But it does require conversion going into vg which wants chr[9-15] and
+        # hal2vg is updated to do this autmatically
+        cmd.append(get_faidx_subpath_rename_cmd())
+        cactus_call(parameters=cmd, stdin_string='\n'.join(faidx_regions) + '\n', outfile=faidx_output_path)
+    else:
+        open(faidx_output_path, 'w').close()
+
+    # split the samtools output back up by reference contig.  this is done by byte range so the
+    # sequence never goes through python line-by-line
+    with open(faidx_output_path, 'rb') as faidx_output_file:
+        faidx_mm = mmap.mmap(faidx_output_file.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(faidx_output_path) else b''
+        try:
+            record_ranges = fasta_record_ranges(faidx_mm, [contig_count for ref_contig, contig_count in ref_contig_counts],
+                                                name=event)
+        finally:
+            if faidx_mm:
+                faidx_mm.close()
+        for (ref_contig, contig_count), (range_start, range_end, num_bases) in zip(ref_contig_counts, record_ranges):
+            contig_fasta_path = os.path.join(work_dir, '{}_{}.fa'.format(event, ref_contig))
+            # TODO: review how cases like contig_count == 0 are handled (we just write an empty file)
+            with open(contig_fasta_path, 'wb') as contig_fasta_file:
+                sendfile_copy(faidx_output_file, contig_fasta_file, range_start, range_end - range_start)
+            if is_gz and contig_count > 0:
+                cactus_call(parameters=['bgzip', '--threads', str(job.cores), contig_fasta_path])
+                contig_fasta_path += '.gz'
+            contig_fa_dict[ref_contig] = job.fileStore.writeGlobalFile(contig_fasta_path)
+            contig_size_dict[ref_contig] = num_bases
+    os.remove(faidx_output_path)
         
     return contig_fa_dict, contig_size_dict
 
+def fasta_record_ranges(fa_buf, record_counts, name='', chunk_size=2**26):
+    """ Take a fasta buffer (ex an mmapped file) whose records come in consecutive groups of the
+    given sizes, and return a (start, end, num_bases) byte range for each group.  The bases are
+    counted as the range length minus the header and newline bytes """
+    buf_size = len(fa_buf)
+
+    # find where each record starts and how big its header line is
+    record_offsets = []
+    header_sizes = []
+    offset = 0
+    while offset < buf_size:
+        if fa_buf[offset:offset+1] != b'>':
+            raise RuntimeError('Error splitting fasta for {}: expected a ">" header at byte {}'.format(name, offset))
+        header_end = fa_buf.find(b'\n', offset)
+        if header_end < 0:
+            header_end = buf_size
+        record_offsets.append(offset)
+        # includes the newline
+        header_sizes.append(header_end + 1 - offset)
+        next_record = fa_buf.find(b'\n>', header_end)
+        offset = next_record + 1 if next_record >= 0 else buf_size
+    record_offsets.append(buf_size)
+
+    expected_records = sum(record_counts)
+    if len(record_offsets) - 1 != expected_records:
+        raise RuntimeError('Error splitting fasta for {}: expected {} records, found {}'.format(name, expected_records, len(record_offsets) - 1))
+
+    record_ranges = []
+    record_idx = 0
+    for record_count in record_counts:
+        range_start, range_end = record_offsets[record_idx], record_offsets[record_idx + record_count]
+        range_header_size = sum(header_sizes[record_idx:record_idx + record_count])
+        record_idx += record_count
+        num_newlines = 0
+        for chunk_start in range(range_start, range_end, chunk_size):
+            num_newlines += fa_buf[chunk_start:min(chunk_start + chunk_size, range_end)].count(b'\n')
+        # the header sizes already count one newline per record
+        num_bases = (range_end - range_start) - range_header_size - (num_newlines - record_count)
+        record_ranges.append((range_start, range_end, num_bases))
+    return record_ranges
+
 def gather_fas(job, output_id_map, contig_fa_map, contig_size_map):
     """ take the split_fas output which has everything sorted by event, and move into the ref-contig-based table
     from split_gfa.  return the updated table, which can then be exported into the chromosome projects """
@@ -633,12 +756,15 @@ def export_split_data(toil, input_name_map, output_id_map, split_log_id, contig_
     
     chrom_file_map = {}
 
+    # list of (file_id, url) to export.  they are all done at once in parallel at the end
+    export_tasks = []
+
     # export the sizes
     contig_size_table_path = os.path.join(output_dir, 'contig_sizes.tsv')
-    toil.exportFile(contig_size_table_id, makeURL(contig_size_table_path))
+    export_tasks.append((contig_size_table_id, makeURL(contig_size_table_path)))
 
     # export the log
-    toil.exportFile(split_log_id, makeURL(os.path.join(output_dir, 'minigraph.split.log')))
+    export_tasks.append((split_log_id, makeURL(os.path.join(output_dir, 'minigraph.split.log'))))
 
     # hack to filter out reference contigs where nothing maps to it (not even itself)
     # this is usually worked around by using --refContigs <chroms> --otherContig chrOther
@@ -651,31 +777,31 @@ def export_split_data(toil, input_name_map, output_id_map, split_log_id, contig_
             # todo: check ambigous?
             continue
         ref_contig_path = os.path.join(output_dir, ref_contig)
-        if not os.path.isdir(ref_contig_path) and not ref_contig_path.startswith('s3://'):
-            os.makedirs(ref_contig_path)
+        if not ref_contig_path.startswith('s3://'):
+            os.makedirs(ref_contig_path, exist_ok=True)
 
-        # GFA: <output_dir>/<contig>/<contig>.gfa
+        # GFA: <output_dir>/<contig>/<contig>.gfa.gz
         if 'gfa' in output_id_map[ref_contig]:
             # we do this check because no gfa made for ambiguous sequences "contig"
-            toil.exportFile(output_id_map[ref_contig]['gfa'], makeURL(os.path.join(ref_contig_path, '{}.gfa'.format(ref_contig))))
+            export_tasks.append((output_id_map[ref_contig]['gfa'], makeURL(os.path.join(ref_contig_path, '{}.gfa.gz'.format(ref_contig)))))
 
         # PAF: <output_dir>/<contig>/<contig>.paf
         paf_path = os.path.join(ref_contig_path, '{}.paf'.format(ref_contig))
         if 'paf' in output_id_map[ref_contig]:
             # rgfa-split doesn't write empty pafs: todo: should it?
-            toil.exportFile(output_id_map[ref_contig]['paf'], makeURL(paf_path))
+            export_tasks.append((output_id_map[ref_contig]['paf'], makeURL(paf_path)))
 
         # Fasta: <output_dir>/<contig>/fasta/<event>_<contig>.fa ..
         seq_file_map = {}
+        fa_base = os.path.join(ref_contig_path, 'fasta')
+        if output_id_map[ref_contig]['fa'] and not fa_base.startswith('s3://'):
+            os.makedirs(fa_base, exist_ok=True)
         for event, ref_contig_fa_id in output_id_map[ref_contig]['fa'].items():
-            fa_base = os.path.join(ref_contig_path, 'fasta')
-            if not os.path.isdir(fa_base) and not fa_base.startswith('s3://'):
-                os.makedirs(fa_base)
             fa_path = makeURL(os.path.join(fa_base, '{}_{}.fa'.format(event, ref_contig)))
             if input_name_map[event].endswith('.gz'):
                 fa_path += '.gz'
             seq_file_map[event] = fa_path
-            toil.exportFile(ref_contig_fa_id, fa_path)
+            export_tasks.append((ref_contig_fa_id, fa_path))
 
         seq_file_map_size = 0
         for event, fa_path in seq_file_map.items():
@@ -692,8 +818,7 @@ def export_split_data(toil, input_name_map, output_id_map, split_log_id, contig_
             seq_file_temp_path = getTempFile()
         else:
             seq_file_temp_path = seq_file_path
-            if not os.path.isdir(os.path.dirname(seq_file_path)):
-                os.makedirs(os.path.dirname(seq_file_path))
+            os.makedirs(os.path.dirname(seq_file_path), exist_ok=True)
         with open(seq_file_temp_path, 'w') as seq_file:
             for event, fa_path in seq_file_map.items():
                 # cactus can't handle empty fastas.  if there are no sequences for a sample for this
@@ -706,6 +831,8 @@ def export_split_data(toil, input_name_map, output_id_map, split_log_id, contig_
         # Top-level seqfile
         chrom_file_map[ref_contig] = seq_file_path, paf_path
 
+    export_files_parallel(toil, export_tasks)
+
     # Chromfile : <coutput_dir>/chromfile.txt
     chrom_file_path = os.path.join(output_dir, 'chromfile.txt')
     if chrom_file_path.startswith('s3://'):
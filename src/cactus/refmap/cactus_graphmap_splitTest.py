@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the fasta splitting done in cactus-graphmap-split
+"""
+
+import unittest
+
+from cactus.refmap.cactus_graphmap_split import fasta_record_ranges
+
+class TestCase(unittest.TestCase):
+
+    def testFastaRecordRanges(self):
+        """Check the byte ranges and base counts for groups of fasta records, including empty groups,
+        empty sequences and multi-line sequences."""
+        groups = [[],
+                  [b'>a\nACGT\n'],
+                  [b'>b1 desc\nAC\nGTA\nC\n', b'>b2\n'],
+                  [],
+                  [b'>c\n\n', b'>d\nNNNNNNNNNN\nNN\n']]
+        fa_buf = b''.join([b''.join(group) for group in groups])
+        # use a tiny chunk size to make sure counting across chunks works
+        record_ranges = fasta_record_ranges(fa_buf, [len(group) for group in groups], name='test', chunk_size=3)
+        self.assertEqual(len(record_ranges), len(groups))
+        offset = 0
+        for group, (start, end, num_bases) in zip(groups, record_ranges):
+            group_bytes = b''.join(group)
+            self.assertEqual((start, end), (offset, offset + len(group_bytes)))
+            self.assertEqual(fa_buf[start:end], group_bytes)
+            expected_bases = sum([len(line) for record in group for line in record.split(b'\n')[1:]])
+            self.assertEqual(num_bases, expected_bases)
+            offset = end
+
+    def testFastaRecordRangesEmpty(self):
+        """An empty buffer is fine as long as no records are expected."""
+        self.assertEqual(fasta_record_ranges(b'', [0, 0]), [(0, 0, 0), (0, 0, 0)])
+
+    def testFastaRecordRangesMismatch(self):
+        """A record count that doesn't match the buffer, or a buffer that isn't fasta, is an error."""
+        with self.assertRaises(RuntimeError):
+            fasta_record_ranges(b'>a\nACGT\n>b\nA\n', [1, 2], name='test')
+        with self.assertRaises(RuntimeError):
+            fasta_record_ranges(b'ACGT\n', [1], name='test')
+
+if __name__ == '__main__':
+    unittest.main()
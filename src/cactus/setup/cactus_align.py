@@ -7,25 +7,26 @@
 """
 import os
 import sys
-from argparse import ArgumentParser
+from argparse import ArgumentParser, Namespace
 import xml.etree.ElementTree as ET
-import copy
 import timeit
 import time
 import multiprocessing
 from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 
 from cactus.shared.common import setupBinaries, importSingularityImage
 from cactus.pipeline.cactus_workflow import cactus_cons_with_resources
 from cactus.progressive.progressive_decomposition import compute_outgroups, parse_seqfile, get_subtree, get_spanning_subtree, get_event_set
 from cactus.progressive.cactus_progressive import export_hal
-from cactus.shared.common import makeURL, catFiles
+from cactus.shared.common import makeURL, cat_seq_dir, can_symlink_inputs
+from cactus.shared.common import import_files_parallel, export_files_parallel
 from cactus.shared.common import enableDumpStack
 from cactus.shared.common import cactus_override_toil_options
 from cactus.shared.common import findRequiredNode
 from cactus.shared.common import getOptionalAttrib
 from cactus.shared.common import cactus_call
-from cactus.shared.common import write_s3, has_s3, get_aws_region, unzip_gzs
+from cactus.shared.common import write_s3, check_s3, has_s3, get_aws_region, unzip_gzs
 from cactus.shared.common import cactusRootPath
 from cactus.shared.common import cactus_clamp_memory
 from cactus.shared.common import clean_jobstore_files
@@ -103,6 +104,9 @@ def main():
                         help="Two-column file mapping genome (col 1) to comma-separated list of sex chromosomes. This information "
                         "will be used to guide outgroup selection so that, where possible, all chromosomes are present in"
                         " at least one outgroup.")        
+    parser.add_argument("--s3PreflightWrite", action="store_true",
+                        help="When the output is on s3, write a small test file to it at startup to catch problems early. "
+                        "By default, only check that the bucket is accessible")
 
     options = parser.parse_args()
 
@@ -143,12 +147,16 @@ def main():
     if options.outHal.startswith('s3://'):
         if not has_s3:
             raise RuntimeError("S3 support requires toil to be installed with [aws]")
-        # write a little something to the bucket now to catch any glaring problems asap
-        test_file = os.path.join(getTempDirectory(), 'check')
-        with open(test_file, 'w') as test_o:
-                test_o.write("\n")
-        region = get_aws_region(options.jobStore) if options.jobStore.startswith('aws:') else None
-        write_s3(test_file, options.outHal if options.outHal.endswith('.hal') else os.path.join(options.outHal, 'test'), region=region)
+        if options.s3PreflightWrite:
+            # write a little something to the bucket now to catch any glaring problems asap
+            test_file = os.path.join(getTempDirectory(), 'check')
+            with open(test_file, 'w') as test_o:
+                    test_o.write("\n")
+            region = get_aws_region(options.jobStore) if options.jobStore.startswith('aws:') else None
+            write_s3(test_file, options.outHal if options.outHal.endswith('.hal') else os.path.join(options.outHal, 'test'), region=region)
+        else:
+            # just make sure we can get at the bucket, which is much cheaper than writing to it
+            check_s3(options.outHal)
         options.checkpointInfo = (get_aws_region(options.jobStore), options.outHal)
     else:
         options.checkpointInfo = None
@@ -217,6 +225,13 @@ def make_batch_align_jobs(options, toil, filestore=None, config_wrapper=None):
     
     result_dict = {}    
     if options.batch is True:
+        if not config_wrapper:
+            # parse the config once here rather than for every chromosome in make_align_job
+            config_wrapper = ConfigWrapper(ET.parse(options.configFile).getroot())
+            config_wrapper.substituteAllPredefinedConstantsWithLiterals(options)
+            config_wrapper.initGPU(options)
+        # the command line overrides are the same for every chromosome, so apply them once here
+        apply_config_overrides(config_wrapper.xmlRoot, options)
         #read the chrom file
         with open(options.seqFile, 'r') as chrom_file:
             for line in chrom_file:
@@ -224,7 +239,8 @@ def make_batch_align_jobs(options, toil, filestore=None, config_wrapper=None):
                 if len(toks):
                     assert len(toks) == 3
                     chrom, seqfile, alnFile = toks[0], toks[1], toks[2]
-                    chrom_options = copy.deepcopy(options)
+                    # shallow copy is enough, since we only set (and never modify) attributes below
+                    chrom_options = Namespace(**vars(options))
                     chrom_options.batch = False
                     if filestore:
                         seqfile_id = toil.importFile(makeURL(seqfile))
@@ -237,7 +253,7 @@ def make_batch_align_jobs(options, toil, filestore=None, config_wrapper=None):
                     if chrom_options.checkpointInfo:
                         chrom_options.checkpointInfo = (chrom_options.checkpointInfo[0],
                                                         os.path.join(chrom_options.checkpointInfo[1], chrom + '.hal'))
-                    chrom_align_job = make_align_job(chrom_options, toil, config_wrapper, chrom)
+                    chrom_align_job = make_align_job(chrom_options, toil, config_wrapper, chrom, apply_overrides=False)
                     result_dict[chrom] = chrom_align_job
     else:
         result_dict[None] = make_align_job(options, toil)
@@ -245,7 +261,36 @@ def make_batch_align_jobs(options, toil, filestore=None, config_wrapper=None):
     return result_dict
     
     
-def make_align_job(options, toil, config_wrapper=None, chrom_name=None):
+def apply_config_overrides(config_node, options):
+    """ apply the cactus-align command line options to the config """
+    cafNode = findRequiredNode(config_node, "caf")
+    barNode = findRequiredNode(config_node, "bar")
+    poaNode = findRequiredNode(barNode, "poa")
+    if options.singleCopySpecies:
+        cafNode.attrib["alignmentFilter"] = "singleCopyEvent:{}".format(options.singleCopySpecies)
+    if options.barMaskFilter:
+        poaNode.attrib["partialOrderAlignmentMaskFilter"] = str(options.barMaskFilter)
+
+    if options.maxLen is not None:
+        barNode.attrib["bandingLimit"] = str(options.maxLen)
+        cafNode.attrib["maxRecoverableChainLength"] = str(int(options.maxLen / 2))
+
+    if options.pangenome:
+        # turn off the megablock filter as it ruins non-all-to-all alignments
+        cafNode.attrib["minimumBlockHomologySupport"] = "0"
+        cafNode.attrib["minimumBlockDegreeToCheckSupport"] = "9999999999"
+        # turn off mapq filtering
+        cafNode.attrib["runMapQFiltering"] = "0"
+        # more iterations here helps quite a bit to reduce underalignment
+        cafNode.attrib["maxRecoverableChainsIterations"] = "50"
+        # turn down minimum block degree to get a fat ancestor
+        barNode.attrib["minimumBlockDegree"] = "1"
+        # turn off POA seeding
+        poaNode.attrib["partialOrderAlignmentDisableSeeding"] = "1"
+    
+def make_align_job(options, toil, config_wrapper=None, chrom_name=None, apply_overrides=True):
+    """ make the align job.  if apply_overrides is False, the caller is responsible for
+    having run apply_config_overrides on config_wrapper """
 
     # load up the seqfile and figure out the outgroups
     if config_wrapper:
@@ -300,45 +345,25 @@ def make_align_job(options, toil, config_wrapper=None, chrom_name=None):
             paf_to_stable = True
 
     # apply command line overrides to config
-    cafNode = findRequiredNode(config_node, "caf")
-    barNode = findRequiredNode(config_node, "bar")
-    poaNode = findRequiredNode(barNode, "poa")
-    if options.singleCopySpecies:
-        cafNode.attrib["alignmentFilter"] = "singleCopyEvent:{}".format(options.singleCopySpecies)
-    if options.barMaskFilter:
-        poaNode.attrib["partialOrderAlignmentMaskFilter"] = str(options.barMaskFilter)
-
-    if options.maxLen is not None:
-        barNode.attrib["bandingLimit"] = str(options.maxLen)
-        cafNode.attrib["maxRecoverableChainLength"] = str(int(options.maxLen / 2))
-
-    if options.pangenome:
-        # turn off the megablock filter as it ruins non-all-to-all alignments
-        cafNode.attrib["minimumBlockHomologySupport"] = "0"
-        cafNode.attrib["minimumBlockDegreeToCheckSupport"] = "9999999999"
-        # turn off mapq filtering
-        cafNode.attrib["runMapQFiltering"] = "0"
-        # more iterations here helps quite a bit to reduce underalignment
-        cafNode.attrib["maxRecoverableChainsIterations"] = "50"
-        # turn down minimum block degree to get a fat ancestor
-        barNode.attrib["minimumBlockDegree"] = "1"
-        # turn off POA seeding
-        poaNode.attrib["partialOrderAlignmentDisableSeeding"] = "1"
+    if apply_overrides:
+        apply_config_overrides(config_node, options)
 
-    # import the PAF alignments
-    paf_id = toil.importFile(makeURL(options.pafFile))
-    
-    #import the sequences
+    #import the sequences (and the PAF alignments)
     input_seq_id_map = {}
+    to_import = []
     for (genome, seq) in input_seq_map.items():
         if genome in event_set:
             if os.path.isdir(seq):
                 tmpSeq = getTempFile()
-                catFiles([os.path.join(seq, subSeq) for subSeq in os.listdir(seq)], tmpSeq)
+                cat_seq_dir(seq, tmpSeq)
                 seq = tmpSeq
             seq = makeURL(seq)
             logger.info("Importing {}".format(seq))
-            input_seq_id_map[genome] = toil.importFile(seq)
+            to_import.append((genome, seq))
+    import_ids = import_files_parallel(toil, [makeURL(options.pafFile)] + [seq for genome, seq in to_import])
+    paf_id = import_ids[0]
+    for (genome, seq), seq_id in zip(to_import, import_ids[1:]):
+        input_seq_id_map[genome] = seq_id
 
     # make the align job that will (optional unzip) -> consolidated -> hal export -> (optional vg/gfa)
     align_job = Job.wrapJobFn(cactus_align,
@@ -400,8 +425,8 @@ def cactus_align(job, config_wrapper, mc_tree, input_seq_map, input_seq_id_map,
 
     # optionally create the VG
     if doVG or doGFA:
-        vg_export_job = hal_job.addFollowOnJobFn(export_vg, hal_job.rv(), config_wrapper, doVG, doGFA, referenceEvents,
-                                                 checkpointInfo=checkpointInfo, memory_override=cons_memory)
+        vg_export_job = hal_job.addFollowOnJobFn(export_vg_with_resources, hal_job.rv(), config_wrapper, doVG, doGFA, referenceEvents,
+                                                 checkpointInfo=checkpointInfo, memory_override=cons_memory, cons_cores=cons_cores)
         vg_file_id, gfa_file_id = vg_export_job.rv(0), vg_export_job.rv(1)
     else:
         vg_file_id, gfa_file_id = None, None
@@ -409,37 +434,51 @@ def cactus_align(job, config_wrapper, mc_tree, input_seq_map, input_seq_id_map,
     return hal_job.rv(), vg_file_id, gfa_file_id
 
 
-def export_vg(job, hal_id, config_wrapper, doVG, doGFA, referenceEvents, checkpointInfo=None, resource_spec = False,
-              memory_override=None):
-    """ use hal2vg to convert the HAL to vg format """
+def export_vg_with_resources(job, hal_id, config_wrapper, doVG, doGFA, referenceEvents, checkpointInfo=None,
+                             memory_override=None, cons_cores=None):
+    """ run export_vg as a child job, requesting resources based on the hal size (cons_cores are only
+    used by bgzip when making the gfa) """
+    # allow override with cons_memory
+    memory = cactus_clamp_memory(hal_id.size * 60) if not memory_override else memory_override
+    # streaming hal2vg right into vg view means both have the graph in memory at the same time,
+    # so we need twice the memory.  if --maxMemory won't allow it, or the user set the memory
+    # themselves (which we don't want to inflate), run them one after the other.
+    stream_gfa = doGFA and not memory_override and cactus_clamp_memory(2 * memory) >= 2 * memory
+    if stream_gfa:
+        memory *= 2
+    # when streaming, there's no vg file on disk unless it's being output or checkpointed
+    vg_on_disk = not stream_gfa or doVG or checkpointInfo
+    return job.addChildJobFn(export_vg, hal_id, config_wrapper, doVG, doGFA, referenceEvents, checkpointInfo,
+                             stream_gfa=stream_gfa,
+                             cores=cons_cores if doGFA else None,
+                             disk=hal_id.size * (3 if vg_on_disk else 2),
+                             memory=memory).rv()
+
+def export_vg(job, hal_id, config_wrapper, doVG, doGFA, referenceEvents, checkpointInfo=None, stream_gfa=False):
+    """ use hal2vg to convert the HAL to vg format. if stream_gfa is set, then the gfa is made
+    by piping hal2vg right into vg view (which needs memory for both at once) """
 
-    if not resource_spec:
-        # caller couldn't figure out the resrouces from hal_id promise.  do that
-        # now and try again
-        return job.addChildJobFn(export_vg, hal_id, config_wrapper, doVG, doGFA, referenceEvents, checkpointInfo,
-                                 resource_spec = True,
-                                 disk=hal_id.size * 3,
-                                 # allow override with cons_memory
-                                 memory=cactus_clamp_memory(hal_id.size * 60) if not memory_override else memory_override).rv()
-        
     work_dir = job.fileStore.getLocalTempDir()
     hal_path = os.path.join(work_dir, "out.hal")
-    job.fileStore.readGlobalFile(hal_id, hal_path)
+    # hal2vg only reads the hal
+    job.fileStore.readGlobalFile(hal_id, hal_path, symlink=can_symlink_inputs())
     
-    graph_event = getOptionalAttrib(findRequiredNode(config_wrapper.xmlRoot, "graphmap"), "assemblyName", default="_MINIGRAPH_")
-    hal2vg_opts = getOptionalAttrib(findRequiredNode(config_wrapper.xmlRoot, "hal2vg"), "hal2vgOptions", default="")
+    graphmap_node = findRequiredNode(config_wrapper.xmlRoot, "graphmap")
+    hal2vg_node = findRequiredNode(config_wrapper.xmlRoot, "hal2vg")
+    graph_event = getOptionalAttrib(graphmap_node, "assemblyName", default="_MINIGRAPH_")
+    hal2vg_opts = getOptionalAttrib(hal2vg_node, "hal2vgOptions", default="")
     if hal2vg_opts:
         hal2vg_opts = hal2vg_opts.split(' ')
     else:
         hal2vg_opts = []
     ignore_events = []
-    if not getOptionalAttrib(findRequiredNode(config_wrapper.xmlRoot, "hal2vg"), "includeMinigraph", typeFn=bool, default=False):
+    if not getOptionalAttrib(hal2vg_node, "includeMinigraph", typeFn=bool, default=False):
         ignore_events.append(graph_event)
-    if not getOptionalAttrib(findRequiredNode(config_wrapper.xmlRoot, "hal2vg"), "includeAncestor", typeFn=bool, default=False):
+    if not getOptionalAttrib(hal2vg_node, "includeAncestor", typeFn=bool, default=False):
         ignore_events.append(config_wrapper.getDefaultInternalNodePrefix() + '0')
     if ignore_events:
         hal2vg_opts += ['--ignoreGenomes', ','.join(ignore_events)]
-    if not getOptionalAttrib(findRequiredNode(config_wrapper.xmlRoot, "hal2vg"), "prependGenomeNames", typeFn=bool, default=True):
+    if not getOptionalAttrib(hal2vg_node, "prependGenomeNames", typeFn=bool, default=True):
         hal2vg_opts += ['--onlySequenceNames']
     ref_events = graph_event
     if referenceEvents:
@@ -448,20 +487,32 @@ def export_vg(job, hal_id, config_wrapper, doVG, doGFA, referenceEvents, checkpo
     hal2vg_opts += ['--refGenomes', ref_events]
 
     vg_path = os.path.join(work_dir, "out.vg")
+    gfa_path = os.path.join(work_dir, "out.gfa.gz")
     cmd = ['hal2vg', hal_path] + hal2vg_opts
-
-    cactus_call(parameters=cmd, outfile=vg_path, job_memory=job.memory)
+    # we need a vg file if we're returning it or checkpointing it
+    write_vg = doVG or checkpointInfo
+
+    if stream_gfa:
+        # make the gfa straight from the hal2vg output stream, tee'ing off the vg only if we need it
+        gfa_cmd = [cmd]
+        if write_vg:
+            gfa_cmd.append(['tee', vg_path])
+        gfa_cmd += [['vg', 'view', '-g', '-'], ['bgzip', '--threads', str(job.cores)]]
+        cactus_call(parameters=gfa_cmd, outfile=gfa_path, job_memory=job.memory)
+    else:
+        cactus_call(parameters=cmd, outfile=vg_path, job_memory=job.memory)
+        if doGFA:
+            gfa_cmd = [['vg', 'view', '-g', vg_path], ['bgzip', '--threads', str(job.cores)]]
+            cactus_call(parameters=gfa_cmd, outfile=gfa_path, job_memory=job.memory)
 
     if checkpointInfo:
-        write_s3(vg_path, os.path.splitext(checkpointInfo[1])[0] + '.vg', region=checkpointInfo[0])
-
-    gfa_path = os.path.join(work_dir, "out.gfa.gz")
-    if doGFA:
-        gfa_cmd = [ ['vg', 'view', '-g', vg_path], ['gzip'] ]
-        cactus_call(parameters=gfa_cmd, outfile=gfa_path)
-
-        if checkpointInfo:
-            write_s3(gfa_path, os.path.splitext(checkpointInfo[1])[0] + '.gfa.gz', region=checkpointInfo[0])
+        ckpt_region, ckpt_stem = checkpointInfo[0], os.path.splitext(checkpointInfo[1])[0]
+        write_s3(vg_path, ckpt_stem + '.vg', region=ckpt_region)
+        if not doVG:
+            # the vg was only made for the checkpoint, so free up the scratch space now
+            os.remove(vg_path)
+        if doGFA:
+            write_s3(gfa_path, ckpt_stem + '.gfa.gz', region=ckpt_region)
 
     vg_id = job.fileStore.writeGlobalFile(vg_path) if doVG else None
     gfa_id = job.fileStore.writeGlobalFile(gfa_path) if doGFA else None
@@ -519,10 +570,13 @@ def main_batch():
     if options.alignCoresOverrides:
         for o in options.alignCoresOverrides:
             try:
-                chrom, cores = o.split(',')
+                parts = o.split(',')
+                if len(parts) != 2:
+                    raise ValueError("expected chrom,cores")
+                chrom, cores = parts
                 cores_overrides[chrom] = int(cores)
-            except:
-                raise RuntimeError("Error parsing alignCoresOverrides \"{}\"".format(o))
+            except ValueError as e:
+                raise RuntimeError("Error parsing alignCoresOverrides \"{}\"".format(o)) from e
     options.alignCoresOverrides = cores_overrides
 
     logger.warning('**************************  WARNING  ********************************')
@@ -535,12 +589,18 @@ def main_batch():
     if options.configOverrides:
         for o in options.configOverrides:
             try:
-                chrom, config_override = o.split(',')
+                parts = o.split(',')
+                if len(parts) != 2:
+                    raise ValueError("expected chrom,configFile")
+                chrom, config_override = parts
                 config_overrides[chrom] = [config_override, None]
-            except:
-                raise RuntimeError("Error parsing configOverrides \"{}\"".format(o))
+            except ValueError as e:
+                raise RuntimeError("Error parsing configOverrides \"{}\"".format(o)) from e
     options.configOverrides = config_overrides
 
+    # split the cactus-align options once here rather than in every align job
+    options.alignOptions = options.alignOptions.split() if options.alignOptions else []
+
     logger.info('Cactus Command: {}'.format(' '.join(sys.argv)))
     logger.info('Cactus Commit: {}'.format(cactus_commit))    
     start_time = timeit.default_timer()
@@ -551,29 +611,37 @@ def main_batch():
         else:
             config_id = toil.importFile(makeURL(options.configFile))
             # load the chromfile into memory
-            chrom_dict = {}
             with open(options.chromFile, 'r') as chrom_file:
-                for line in chrom_file:
-                    toks = line.strip().split()
-                    if len(toks):
-                        assert len(toks) == 3
-                        chrom, seqfile, alnFile = toks[0], toks[1], toks[2]
-                        chrom_dict[chrom] = toil.importFile(makeURL(seqfile)), toil.importFile(makeURL(alnFile))
-                        if chrom in options.configOverrides:
-                            options.configOverrides[chrom][1] = toil.importFile(makeURL(options.configOverrides[chrom][0]))
+                chrom_rows = [line.split() for line in chrom_file.read().splitlines() if line.strip()]
+            for row in chrom_rows:
+                if len(row) != 3:
+                    raise RuntimeError("Error parsing chromFile line \"{}\": expected 3 columns (chrom seqfile alnFile)".format(' '.join(row)))
+            import_urls = []
+            for chrom, seqfile, alnFile in chrom_rows:
+                import_urls += [makeURL(seqfile), makeURL(alnFile)]
+                if chrom in options.configOverrides:
+                    import_urls.append(makeURL(options.configOverrides[chrom][0]))
+            import_ids = iter(import_files_parallel(toil, import_urls))
+            chrom_dict = {}
+            for chrom, seqfile, alnFile in chrom_rows:
+                chrom_dict[chrom] = next(import_ids), next(import_ids)
+                if chrom in options.configOverrides:
+                    options.configOverrides[chrom][1] = next(import_ids)
             results_dict = toil.start(Job.wrapJobFn(align_toil_batch, chrom_dict, config_id, options))
 
         # when using s3 output urls, things get checkpointed as they're made so no reason to export
         # todo: make a more unified interface throughout cactus for this
         # (see toil-vg's outstore logic which, while not perfect, would be an improvement
         if not options.outHal.startswith('s3://'):
+            export_tasks = []
             for chrom, results in results_dict.items():
-                toil.exportFile(results[0], makeURL(os.path.join(options.outHal, '{}.hal'.format(chrom))))
+                export_tasks.append((results[0], makeURL(os.path.join(options.outHal, '{}.hal'.format(chrom)))))
                 if results[1]:
-                    toil.exportFile(results[1], makeURL(os.path.join(options.outHal, '{}.vg'.format(chrom))))
+                    export_tasks.append((results[1], makeURL(os.path.join(options.outHal, '{}.vg'.format(chrom)))))
                 if results[2]:
-                    toil.exportFile(results[2], makeURL(os.path.join(options.outHal, '{}.gfa.gz'.format(chrom))))
-                toil.exportFile(results[3], makeURL(os.path.join(options.outHal, '{}.hal.log'.format(chrom))))
+                    export_tasks.append((results[2], makeURL(os.path.join(options.outHal, '{}.gfa.gz'.format(chrom)))))
+                export_tasks.append((results[3], makeURL(os.path.join(options.outHal, '{}.hal.log'.format(chrom)))))
+            export_files_parallel(toil, export_tasks)
             
     end_time = timeit.default_timer()
     run_time = end_time - start_time
@@ -605,14 +673,16 @@ def align_toil(job, chrom, seq_file_id, paf_file_id, config_id, options):
     """ run cactus-align """
     
     work_dir = job.fileStore.getLocalTempDir()
+    # cactus-align only reads its inputs
+    symlink = can_symlink_inputs()
     config_file = os.path.join(work_dir, 'config.xml')
-    job.fileStore.readGlobalFile(config_id, config_file)
+    job.fileStore.readGlobalFile(config_id, config_file, symlink=symlink)
 
     seq_file = os.path.join(work_dir, '{}_seq_file.txt'.format(chrom))
-    job.fileStore.readGlobalFile(seq_file_id, seq_file)
+    job.fileStore.readGlobalFile(seq_file_id, seq_file, symlink=symlink)
 
     paf_file = os.path.join(work_dir, '{}.paf'.format(chrom))
-    job.fileStore.readGlobalFile(paf_file_id, paf_file)
+    job.fileStore.readGlobalFile(paf_file_id, paf_file, symlink=symlink)
 
     js = os.path.join(work_dir, 'js')
 
@@ -623,7 +693,7 @@ def align_toil(job, chrom, seq_file_id, paf_file_id, config_id, options):
 
     log_file = os.path.join(work_dir, '{}.hal.log'.format(chrom))
 
-    cmd = ['cactus-align', js, seq_file, paf_file, out_file, '--logFile', log_file, '--configFile', config_file] + options.alignOptions.split()
+    cmd = ['cactus-align', js, seq_file, paf_file, out_file, '--logFile', log_file, '--configFile', config_file] + options.alignOptions
     cores=options.alignCoresOverrides[chrom] if chrom in options.alignCoresOverrides else options.alignCores
     if cores:
         cmd += ['--consCores', str(cores)]
@@ -634,14 +704,15 @@ def align_toil(job, chrom, seq_file_id, paf_file_id, config_id, options):
 
     if not options.outHal.startswith('s3://'):
         # we're not checkpoint directly to s3, so we return 
-        ret_ids[0] = job.fileStore.writeGlobalFile(out_file)
-        out_vg = os.path.splitext(out_file)[0] + '.vg'
-        if os.path.exists(out_vg):
-            ret_ids[1] = job.fileStore.writeGlobalFile(out_vg)
-        out_gfa = os.path.splitext(out_file)[0] + '.gfa.gz'
-        if os.path.exists(out_gfa):
-            ret_ids[2] = job.fileStore.writeGlobalFile(out_gfa)
-        ret_ids[3] = job.fileStore.writeGlobalFile(log_file)
+        # list the work dir once to see which of the optional outputs (vg, gfa) got made
+        work_dir_files = {entry.name : entry.path for entry in os.scandir(work_dir)}
+        out_paths = [out_file,
+                     work_dir_files.get('{}.vg'.format(chrom)),
+                     work_dir_files.get('{}.gfa.gz'.format(chrom)),
+                     log_file]
+        with ThreadPoolExecutor(max_workers=4) as write_pool:
+            write_futures = [write_pool.submit(job.fileStore.writeGlobalFile, out_path) if out_path else None for out_path in out_paths]
+            ret_ids = [write_future.result() if write_future else None for write_future in write_futures]
     else:
         write_s3(log_file, out_file + '.log', region=get_aws_region(options.jobStore))            
 
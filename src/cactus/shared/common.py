@@ -23,6 +23,8 @@ import threading
 import traceback
 import errno
 import shlex
+import gzip
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import boto3
@@ -136,6 +138,61 @@ def catFiles(filesToCat, catFile):
         system("cat %s >> %s" % (" ".join(filesToCat[:maxCat]), catFile))
         filesToCat = filesToCat[maxCat:]
 
+def sendfile_copy(in_file, out_file, offset=0, count=None):
+    """ Copy count bytes (or everything, if count is None) starting at offset from one open binary file
+    to the end of another.  This is done in-kernel with os.sendfile where possible """
+    out_file.flush()
+    end = offset + count if count is not None else None
+    try:
+        while end is None or offset < end:
+            sent = os.sendfile(out_file.fileno(), in_file.fileno(), offset, 2**30 if end is None else min(2**30, end - offset))
+            if sent == 0:
+                break
+            offset += sent
+    except (OSError, AttributeError):
+        # sendfile not supported: finish the copy in userspace
+        in_file.seek(offset)
+        while end is None or offset < end:
+            buf = in_file.read(2**20 if end is None else min(2**20, end - offset))
+            if not buf:
+                break
+            out_file.write(buf)
+            offset += len(buf)
+
+def cat_seq_dir(seq_dir, catFile):
+    """ Concatenate all the regular files in a (sequence) directory into one uncompressed file, in
+    sorted order.  Gzipped files are decompressed on the way, and plain ones are copied in-kernel
+    with os.sendfile where possible """
+    sub_paths = sorted([entry.path for entry in os.scandir(seq_dir) if entry.is_file()])
+    with open(catFile, 'wb') as cat_file:
+        for sub_path in sub_paths:
+            with open(sub_path, 'rb') as sub_file:
+                is_gz = sub_file.read(2) == b'\x1f\x8b'
+                sub_file.seek(0)
+                if is_gz:
+                    with gzip.GzipFile(fileobj=sub_file) as gz_file:
+                        shutil.copyfileobj(gz_file, cat_file, 2**20)
+                else:
+                    sendfile_copy(sub_file, cat_file)
+
+def io_pool_size(num_tasks):
+    """ Number of threads to use for a batch of i/o bound tasks like imports and exports (which
+    spend their time waiting on the network/disk, so threads are fine) """
+    return max(1, min(32, num_tasks))
+
+def import_files_parallel(toil, urls):
+    """ Import a list of urls with toil.importFile using a thread pool, returning the ids in the
+    same order.  Duplicate urls are only imported once """
+    unique_urls = list(dict.fromkeys(urls))
+    with ThreadPoolExecutor(max_workers=io_pool_size(len(unique_urls))) as import_pool:
+        url_to_id = dict(zip(unique_urls, import_pool.map(toil.importFile, unique_urls)))
+    return [url_to_id[url] for url in urls]
+
+def export_files_parallel(toil, export_tasks):
+    """ Export a list of (file_id, url) pairs with toil.exportFile using a thread pool """
+    with ThreadPoolExecutor(max_workers=io_pool_size(len(export_tasks))) as export_pool:
+        list(export_pool.map(lambda export_task : toil.exportFile(*export_task), export_tasks))
+
 def cactusRootPath():
     """
     function for finding external location
@@ -426,6 +483,12 @@ def setupBinaries(options):
     if options.workDir:
         os.environ['TMPDIR'] = os.path.abspath(options.workDir)
 
+def can_symlink_inputs():
+    """ Can job inputs be symlinked out of the file store (readGlobalFile(symlink=True))?  Only when
+    the binaries are run locally: in a container only the work dir is mounted, so the links
+    wouldn't resolve """
+    return os.environ.get("CACTUS_BINARIES_MODE", "docker") == "local"
+
 def importSingularityImage(options):
     """Import the Singularity image from Docker if using Singularity."""
     mode = os.environ.get("CACTUS_BINARIES_MODE", "docker")
@@ -1152,17 +1215,33 @@ def get_aws_region(full_path):
     else:
         return None
 
+def get_s3_client():
+    """ connect to the s3 service """
+    botocore_session = botocore.session.get_session()
+    botocore_session.get_component('credential_provider').get_provider('assume-role').cache = botocore.credentials.JSONFileCache()
+    boto3_session = boto3.Session(botocore_session=botocore_session)
+    return boto3_session.client('s3')
+
+def check_s3(s3_path):
+    """ make sure the bucket of an s3 path is accessible without writing anything to it.  a bucket
+    that doesn't exist yet is okay, since write_s3 will create it """
+    assert s3_path.startswith('s3://')
+    bucket_name = s3_path[5:].split("/", 1)[0]
+    s3 = get_s3_client()
+    try:
+        s3.head_bucket(Bucket=bucket_name)
+    except botocore.exceptions.ClientError as e:
+        if e.response.get('Error', {}).get('Code') not in ['404', 'NoSuchBucket']:
+            raise
+
 def write_s3(local_path, s3_path, region=None):
     """ cribbed from toil-vg.  more convenient just to throw hal output on s3
     than pass it as a promise all the way back to the start job to export it locally """
     assert s3_path.startswith('s3://')
     bucket_name, name_prefix = s3_path[5:].split("/", 1)
-    botocore_session = botocore.session.get_session()
-    botocore_session.get_component('credential_provider').get_provider('assume-role').cache = botocore.credentials.JSONFileCache()
-    boto3_session = boto3.Session(botocore_session=botocore_session)
 
     # Connect to the s3 bucket service where we keep everything
-    s3 = boto3_session.client('s3')
+    s3 = get_s3_client()
     try:
         s3.head_bucket(Bucket=bucket_name)
     except:
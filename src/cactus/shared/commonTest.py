@@ -1,5 +1,6 @@
 import os
 import shutil
+import gzip
 import unittest
 from base64 import b64encode
 
@@ -9,7 +10,7 @@ from sonLib.bioio import getTempDirectory
 from sonLib.bioio import system
 from toil.job import Job
 from toil.common import Toil
-from cactus.shared.common import cactus_call, ChildTreeJob
+from cactus.shared.common import cactus_call, ChildTreeJob, cat_seq_dir
 
 class TestCase(unittest.TestCase):
     def setUp(self):
@@ -58,6 +59,29 @@ class TestCase(unittest.TestCase):
                              check_output=True)
         self.assertEqual(output, 'quuxbazbar\n')
 
+    @TestStatus.shortLength
+    def testCatSeqDir(self):
+        """Check that cat_seq_dir concatenates the regular files of a directory in sorted order,
+        decompressing the gzipped ones and skipping subdirectories."""
+        seqDir = os.path.join(self.tempDir, 'seqs')
+        os.makedirs(os.path.join(seqDir, 'subdir'))
+        with open(os.path.join(seqDir, 'subdir', 'a.fa'), 'wb') as f:
+            f.write(b'>skipped\nNNNN\n')
+        # (d.fa is gzipped without the extension to make sure it's sniffed by its contents)
+        plainFiles = {'c.fa' : b'>c\nGGGG\nTT\n', 'b.fa' : b'>b\nCCCC\n'}
+        gzFiles = {'a.fa.gz' : b'>a\nAAAA\n', 'd.fa' : b'>d1\nACGT\n>d2\n\n'}
+        for name, data in plainFiles.items():
+            with open(os.path.join(seqDir, name), 'wb') as f:
+                f.write(data)
+        for name, data in gzFiles.items():
+            with gzip.open(os.path.join(seqDir, name), 'wb') as f:
+                f.write(data)
+
+        outFile = getTempFile(rootDir=self.tempDir)
+        cat_seq_dir(seqDir, outFile)
+        with open(outFile, 'rb') as f:
+            self.assertEqual(f.read(), b'>a\nAAAA\n>b\nCCCC\n>c\nGGGG\nTT\n>d1\nACGT\n>d2\n\n')
+
     @TestStatus.mediumLength
     def testChildTreeJob(self):
         """Check that the ChildTreeJob class runs all children."""